@@ -0,0 +1,29 @@
+'''
+Tests for update_kaggle_metadata.py
+  python -m unittest test_update_kaggle_metadata.py
+'''
+
+import unittest
+
+import update_kaggle_metadata as ukm
+
+
+class TestCompareMatchesUsrBinSort(unittest.TestCase):
+  ''' merge_files compares raw bytes, which must agree with how the
+      LC_ALL=C sort ordered the updates file '''
+
+  def test_sort_by_paper_id(self):
+    self.assertLess(b'0704.0002', b'cs/1')
+
+
+class TestGetJsonPaperId(unittest.TestCase):
+  def test_extracts_paper_id(self):
+    line = b'{"id":"1408.5307","submitter":"someone"}\n'
+    self.assertEqual(ukm.get_json_paper_id(line), b'1408.5307')
+
+  def test_empty_line_at_eof(self):
+    self.assertEqual(ukm.get_json_paper_id(b''), b'')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -47,15 +47,29 @@ TODO: Ok to share script?
 '''
 
 import argparse
+import hashlib
+import heapq
 import json
+import multiprocessing
 import os
+import re
 import requests
+import subprocess
 import sys
 import time
-import unittest
-import xml.etree.ElementTree as ET
+try:                                   # libxml2-backed parsing is ~10x faster
+  from lxml import etree as ET
+except ImportError:
+  import xml.etree.ElementTree as ET
+try:                                   # 2-3x faster dumps for small dicts
+  import orjson
+except ImportError:
+  orjson = None
 from datetime import date, datetime, timedelta
-from shutil   import move 
+from functools import lru_cache
+from io       import BytesIO
+from requests.adapters import HTTPAdapter, Retry
+from shutil   import move
 
 
 DATA_DIR       = '/home/markn/Documents/arxiv/TexToHtml/DataDir'
@@ -64,13 +78,63 @@ F_TMP_UPDATES  = f'{ DATA_DIR }/tmp_updates.json'
 F_TMP_SORTED   = f'{ DATA_DIR }/tmp_updates_sorted.json'
 F_TMP_MERGED   = f'{ DATA_DIR }/tmp_merged.json'
 FROM_DAYS_AGO  = 7
+OAI_REQUEST_INTERVAL = 10              # OAI server usually requires a 10s wait
 OAI_XML_NAMESPACES = {
   'OAI'  : 'http://www.openarchives.org/OAI/2.0/',
   'arXiv': 'http://arxiv.org/OAI/arXivRaw/'
 }
+OAI_NS   = f"{{{ OAI_XML_NAMESPACES['OAI'] }}}"
+ARXIV_NS = f"{{{ OAI_XML_NAMESPACES['arXiv'] }}}"
+TEXT_KEYS = (
+  'id', 'submitter', 'authors', 'title', 'comments',
+  'journal-ref', 'doi', 'report-no',
+  'categories', 'license',
+  'abstract',
+)
+                                       # Clark-notation tags, built once:
+                                       # find() skips the namespace-map
+                                       # resolution done per call otherwise
+CLARK          = { name: f'{ ARXIV_NS }{ name }'
+                   for name in TEXT_KEYS + ('version', 'date') }
+RECORD_TAG     = f'{ OAI_NS }record'
+TOKEN_TAG      = f'{ OAI_NS }resumptionToken'
+ARXIV_RAW_PATH = f'{ OAI_NS }metadata/{ ARXIV_NS }arXivRaw'
+DATESTAMP_PATH = f'{ OAI_NS }header/{ OAI_NS }datestamp'
 URL_ARXIV_OAI = 'https://export.arxiv.org/oai2'
+                                       # keep-alive: one TCP/TLS connection
+                                       # reused across every chunk request.
+                                       # Retry handles the OAI 503
+                                       # wait-and-retry dance, honoring
+                                       # Retry-After
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+  pool_connections=1, pool_maxsize=1,
+  max_retries=Retry(total=5, status_forcelist=(503,), backoff_factor=1.5),
+))
 
 args = None
+                                       # paper_id -> update_date from the
+                                       # current snapshot; loaded before the
+                                       # harvest so unchanged records can be
+                                       # dropped before the expensive work
+latest_update = {}
+count_skipped_records = 0
+
+def load_latest_update_dates():
+  ''' Stream the snapshot once, slicing paper_id and update_date out of the
+      raw bytes of each line '''
+  latest = {}
+  if not os.path.exists(args.json_file):
+    return latest
+  with open(args.json_file, 'rb', buffering=1<<20) as f:
+    for line in f:
+      start = line.rfind(b'"update_date":"')
+      if start != -1:
+        start = start + 15
+        paper_id = get_json_paper_id(line)
+        latest[paper_id.decode()] = line[start : line.index(b'"', start)].decode()
+  return latest
+
 
 def main():
   parse_args()
@@ -86,11 +150,12 @@ def main():
   sort_the_updates_file()
   merge_files()
   check_merged_then_overwrite_original()
+  clear_checkpoint()
 
 
 def check_merged_then_overwrite_original():
-  json_lines       = sum(1 for line in open(args.json_file))
-  tmp_merged_lines = sum(1 for line in open(args.tmp_merged_file))
+  json_lines       = count_lines(args.json_file)
+  tmp_merged_lines = count_lines(args.tmp_merged_file)
   info(f'Comparing file lines:   json:{ json_lines:9}')
   info(f'Comparing file lines: merged:{ tmp_merged_lines:9}')
 
@@ -105,27 +170,80 @@ def check_merged_then_overwrite_original():
   pass
 
 
+def count_lines(path):
+  ''' Count newlines in 4 MiB raw chunks: no per-line Python iteration '''
+  with open(path, 'rb', buffering=0) as f:
+    if hasattr(os, 'posix_fadvise'):   # hint the kernel for readahead
+      os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1<<22), b''))
+
+
 def debug(s, min_verbose=1):
   if args.verbose >= min_verbose:
     print( f'{ s }' )
 
 
 def download_updates():
+  global latest_update
+  latest_update = load_latest_update_dates()
+  info(f'Loaded update dates for { len(latest_update) } snapshot papers')
+
   rt = args.resumption_token if args.resumption_token else None
+  if not rt:
+    rt = read_checkpoint()
+    if rt:
+      info(f'Resuming interrupted harvest from checkpointed token { rt }')
 
   chunk_index   = 0
   total_records = 0
   more_oai_updates = True
   while more_oai_updates:
+    request_started = time.monotonic()
     xml = get_listrecord_chunk(rt)
 
+                                       # parse/write runs down the mandatory
+                                       # request interval, so the crawl only
+                                       # idles for whatever remains of it
     rt, c = parse_and_save_listrecord_as_json(xml, rt)
+    write_checkpoint(rt)
     chunk_index   = chunk_index + 1
     total_records = total_records + c
     info(f'{ chunk_index:4} | Records { total_records:7} | { rt }')
 
     if not rt:
       more_oai_updates = False
+    else:
+      remaining = OAI_REQUEST_INTERVAL - (time.monotonic() - request_started)
+      if remaining > 0:
+        time.sleep(remaining)
+
+  info(f'Skipped { count_skipped_records } records unchanged since the snapshot')
+
+
+                                       # A crash mid-harvest used to discard
+                                       # hours of rate-limited chunks; the
+                                       # .rt sidecar next to the updates file
+                                       # lets the next run pick up where the
+                                       # interrupted one stopped.
+def checkpoint_path():
+  return f'{ args.tmp_updates_file }.rt'
+
+
+def read_checkpoint():
+  if os.path.exists(checkpoint_path()):
+    with open(checkpoint_path()) as f:
+      return f.read().strip() or None
+  return None
+
+
+def write_checkpoint(rt):
+  with open(checkpoint_path(), 'w') as f:
+    f.write(rt or '')
+
+
+def clear_checkpoint():
+  if os.path.exists(checkpoint_path()):
+    os.remove(checkpoint_path())
 
 
 def get_listrecord_chunk(
@@ -145,18 +263,11 @@ def get_listrecord_chunk(
       parameters['from'] = f'{ date.today() - timedelta(days=args.from_days_ago) }'
       info(f'Loading metadata starting { args.from_days_ago } days ago (from { parameters["from"] })')
 
-  response = requests.get(harvest_url, params=parameters)
+  response = _session.get(harvest_url, params=parameters, timeout=60)
 
   if response.status_code == 200:
-    time.sleep(12)                     # OAI server usually requires a 10s wait
     return response.text
 
-  elif response.status_code == 503:
-    secs = int(response.headers.get('Retry-After', 20)) * 1.5
-    info(f'Requested to wait, waiting { secs } seconds until retry...')
-    time.sleep(secs)
-    return get_list_record_chunk(resumption_token=resumption_token)
-
   else:
     raise Exception(
       f'''Unknown error in HTTP request { response.url }, 
@@ -164,10 +275,11 @@ def get_listrecord_chunk(
       '''
     )
 
-                                       # Extract paper_id from json
+                                       # Extract paper_id from a json line,
+                                       # kept as bytes to skip utf-8 decode
                                        # e.g.:  {"id":"1408.5307","sub...
 def get_json_paper_id(s):
-  return s[7 : s.find('"',7)]
+  return s[7 : s.index(b'"', 7)] if s else b''
 
 
 def info(s):
@@ -181,81 +293,55 @@ def merge_files():
         - to sort on the arXiv paperId/"id".
         - files to contain json, begin with key "id", and have no whitespace.
   '''
-  json_file       = open(args.json_file)
-  tmp_sorted_file = open(args.tmp_sorted_file)
-  tmp_merged_file = open(args.tmp_merged_file, 'w')
+                                       # binary mode with large buffers: the
+                                       # loop only inspects a short byte
+                                       # prefix per line, no decode needed
+  json_file       = open(args.json_file,       'rb', buffering=1<<20)
+  tmp_sorted_file = open(args.tmp_sorted_file, 'rb', buffering=1<<20)
+  tmp_merged_file = open(args.tmp_merged_file, 'wb', buffering=1<<20)
 
   count_json_papers     = 0
   count_merged_papers   = 0
-  count_new_papers      = 0
   count_replaced_papers = 0
   count_sorted_papers   = 0
   count_identical_lines = 0
 
-                                       # todo: fix for first run on json
-  json_string         = json_file.readline()
-  json_paper_id       = get_json_paper_id(json_string)
-  tmp_sorted_string   = tmp_sorted_file.readline()
-  tmp_sorted_paper_id = get_json_paper_id(tmp_sorted_string)
-
-                                       # read to the end of each file
-  while json_paper_id or tmp_sorted_paper_id:
-    advance_json_file   = False
-    advance_sorted_file = False
-    write_json_string   = False
-    write_sorted_string = False
-
-                                       # when only one file has remaining papers
-    if not json_paper_id:
-      advance_sorted_file = True
-      write_sorted_string = True
+                                       # heapq.merge does the k-way ordering
+                                       # in C; source 0/1 breaks id ties so
+                                       # a sorted update always arrives just
+                                       # before the json original it replaces
+  SOURCE_SORTED = 0
+  SOURCE_JSON   = 1
+
+  def keyed(file, source):
+    for line in file:
+      yield get_json_paper_id(line), source, line
+
+  write_merged  = tmp_merged_file.write
+  previous_id   = None
+  previous_line = None
+  for paper_id, source, line in heapq.merge(
+      keyed(tmp_sorted_file, SOURCE_SORTED), keyed(json_file, SOURCE_JSON)):
+
+    if source == SOURCE_SORTED:
       count_sorted_papers = count_sorted_papers + 1
-    elif not tmp_sorted_paper_id:
-      advance_json_file   = True
-      write_json_string   = True
-      count_json_papers   = count_json_papers + 1
     else:
-                                       # mostly, existing records are copied over:
-      if json_paper_id < tmp_sorted_paper_id:
-        write_json_string   = True
-        advance_json_file   = True
-        count_json_papers   = count_json_papers + 1
-
-                                       # replace metadata from the sorted updates:
-      elif json_paper_id == tmp_sorted_paper_id:
-        write_sorted_string   = True
-        advance_sorted_file   = True
-        advance_json_file     = True
-        count_json_papers     = count_json_papers     + 1
-        count_sorted_papers   = count_sorted_papers   + 1
+      count_json_papers = count_json_papers + 1
+                                       # replace metadata from the sorted
+                                       # updates: the update was already
+                                       # written, drop the original
+      if paper_id == previous_id:
         count_replaced_papers = count_replaced_papers + 1
-
-        if json_string == tmp_sorted_string:
+        if line == previous_line:
           count_identical_lines = count_identical_lines + 1
+        continue
+
+    write_merged(line)
+    count_merged_papers = count_merged_papers + 1
+    previous_id   = paper_id
+    previous_line = line
 
-                                       # The sorted file has a new paper:
-      elif tmp_sorted_paper_id < json_paper_id:
-        write_sorted_string = True
-        advance_sorted_file = True
-        count_sorted_papers = count_sorted_papers + 1
-        count_new_papers    = count_new_papers    + 1
-
-                                       # write lines to new merged file:
-    if write_json_string:
-      print(json_string, file=tmp_merged_file, end='')
-      count_merged_papers = count_merged_papers + 1
-    if write_sorted_string:
-      print(tmp_sorted_string, file=tmp_merged_file, end='')
-      count_merged_papers = count_merged_papers + 1
-
-                                       # then advance in files for existing and updated:
-    if advance_json_file:
-      json_string   = json_file.readline()
-      json_paper_id = get_json_paper_id(json_string)
-    if advance_sorted_file:
-      tmp_sorted_string   = tmp_sorted_file.readline()
-      tmp_sorted_paper_id = get_json_paper_id(tmp_sorted_string)
-     
+  count_new_papers = count_sorted_papers - count_replaced_papers
 
   json_file.close()
   tmp_sorted_file.close()
@@ -273,44 +359,43 @@ def parse_and_save_listrecord_as_json(xml, resumption_token):
   ''' Convert oai xml, and look for next token '''
 
   count_records = 0
-  mode = 'a' if resumption_token else 'w'
-  with open(args.tmp_updates_file, mode) as tmp_update_file:
-    root = ET.fromstring(xml)
-
-    records = root.findall('OAI:ListRecords/OAI:record', OAI_XML_NAMESPACES)
-    for record in records:
-
-      arXivRaw = record.find('OAI:metadata/arXiv:arXivRaw', OAI_XML_NAMESPACES)
+  next_resumption_token = None
+  mode = 'ab' if resumption_token else 'wb'
+  with open(args.tmp_updates_file, mode, buffering=1<<20) as tmp_update_file:
+
+    def record_blobs():
+                                       # stream record by record: peak memory
+                                       # is one <record>, not the whole chunk.
+                                       # bytes keep lxml happy with the
+                                       # <?xml encoding="UTF-8"?> declaration
+      nonlocal next_resumption_token
+      for _, elem in ET.iterparse(BytesIO(xml.encode()), events=('end',)):
+        if elem.tag == TOKEN_TAG:
+          next_resumption_token = elem.text
+          continue
+        if elem.tag != RECORD_TAG:
+          continue
+        yield ET.tostring(elem)
+                                       # free the finished record (and, on
+                                       # lxml, its already-seen siblings)
+        elem.clear()
+        parent = elem.getparent() if hasattr(elem, 'getparent') else None
+        if parent is not None:
+          while elem.getprevious() is not None:
+            del parent[0]
+
+                                       # records are independent, so convert
+                                       # them across cores; imap keeps the
+                                       # output in document order
+    global count_skipped_records
+    for payload in _worker_pool().imap(_convert_record_blob, record_blobs(),
+                                       chunksize=POOL_CHUNKSIZE):
+      if payload is None:              # unchanged since the snapshot
+        count_skipped_records = count_skipped_records + 1
+        continue
+      tmp_update_file.write(payload)
       count_records = count_records + 1
 
-      text_keys = [
-          'id', 'submitter', 'authors', 'title', 'comments',
-          'journal-ref', 'doi', 'report-no',
-          'categories', 'license', 
-          'abstract', 
-      ]
-      output = { key: _record_element_text(arXivRaw, key) for key in text_keys }
-
-      output['versions'] = []
-      for version in _record_element_all(arXivRaw, 'version'):
-        h = {}
-        h['version'] = version.attrib['version']
-        h['created'] = _record_element_text(version, 'date')
-        output['versions'].append(h)
-
-      update_date = record.find('OAI:header/OAI:datestamp', OAI_XML_NAMESPACES).text
-      if update_date:
-        output['update_date'] = update_date
-
-                                         # Derived
-      output['authors_parsed'] = parse_author_affil_utf(output['authors'])
-
-      print(json.dumps(output, separators=(',', ':')), 
-            file=tmp_update_file)
-
-  rt = root.find('OAI:ListRecords/OAI:resumptionToken', OAI_XML_NAMESPACES)
-  next_resumption_token = rt.text if rt is not None else None
-
   return next_resumption_token, count_records
 
 
@@ -330,27 +415,116 @@ def parse_args():
   args = p.parse_args()
 
 
-def _record_element_all(elm, name):
-  """ Extract text from multiple nodes """
-  return elm.findall(f'arXiv:{ name }', OAI_XML_NAMESPACES) if elm is not None else []
-
+if orjson is not None:
+  def _dump_json_line(output):
+    """ One compact json line as bytes """
+    return orjson.dumps(output) + b'\n'
+else:
+  def _dump_json_line(output):
+    """ One compact json line as bytes """
+    return (json.dumps(output, separators=(',', ':')) + '\n').encode()
+
+
+def _convert_record(record):
+  """ Extract one OAI <record> element into the output dict,
+      serialized as a json line """
+
+  arXivRaw = record.find(ARXIV_RAW_PATH)
+
+                                       # fromkeys sizes the dict once; the
+                                       # comprehension grew and rehashed it
+  output = dict.fromkeys(TEXT_KEYS)
+  for key in TEXT_KEYS:
+    output[key] = _record_element_text(arXivRaw, key)
+
+                                       # scanning the children directly
+                                       # skips findall's path machinery;
+                                       # the namespace is fixed and known
+  output['versions'] = []
+  for version in (arXivRaw if arXivRaw is not None else ()):
+    if version.tag != _VERSION_TAG:
+      continue
+    h = {}
+    h['version'] = version.attrib['version']
+    h['created'] = None
+    for child in version:
+      if child.tag == _DATE_TAG:
+        h['created'] = child.text
+        break
+    output['versions'].append(h)
+
+  update_date = record.find(DATESTAMP_PATH).text
+  if update_date:
+    output['update_date'] = update_date
+                                       # OAI retransmits plenty of records
+                                       # the snapshot already has; bail out
+                                       # before author parsing and dumps
+    if latest_update.get(output['id']) == update_date:
+      return None
+
+                                       # Derived
+  output['authors_parsed'] = _parse_author_affil_utf_cached(output['authors'])
+
+  return _dump_json_line(output)
+
+
+def _convert_record_blob(blob):
+  """ Pool worker: re-parse one serialized <record> subtree and convert """
+  return _convert_record(ET.fromstring(blob))
+
+
+_pool = None
+POOL_CHUNKSIZE = 32                    # records handed to a worker per task;
+                                       # amortizes the per-call IPC overhead,
+                                       # which would dominate at chunksize 1
+
+def _worker_pool():
+  """ Lazily-created process pool, reused across chunks.
+
+  Workers fork from this process, so the tex2utf/author caches they
+  build up are per-worker and persist for the whole harvest. """
+  global _pool
+  if _pool is None:
+    _pool = multiprocessing.Pool(os.cpu_count())
+  return _pool
+
+
+_authors_parsed_cache = {}
+
+def _parse_author_affil_utf_cached(authors):
+  """ Memoized parse_author_affil_utf.
+      Weekly updates are mostly resubmissions, so the same authors line
+      shows up again and again; parsing it is the heaviest per-record CPU
+      cost. 8-byte blake2b digests keep the cache keys small. """
+  if not authors:
+    return []
+  key = hashlib.blake2b(authors.encode(), digest_size=8).digest()
+  parsed = _authors_parsed_cache.get(key)
+  if parsed is None:
+    parsed = parse_author_affil_utf(authors)
+    _authors_parsed_cache[key] = parsed
+  return parsed
+
+
+_VERSION_TAG = CLARK['version']
+_DATE_TAG    = CLARK['date']
 
 def _record_element_text(elm, name):
   """ Extract text from leaf (single-node) elements """
-  item = elm.find(f'arXiv:{ name }', OAI_XML_NAMESPACES) if elm is not None else None
+  item = elm.find(CLARK[name]) if elm is not None else None
   return item.text if item is not None else None
 
 
 def sort_the_updates_file():
-  result = os.system( f'sort -o {args.tmp_sorted_file} {args.tmp_updates_file}' )
-  if result != 0:
-    print(f'Issue sorting')
-
-                                       # python -m unittest update_kaggle_metadata.py
-class TestCompareMatchesUsrBinSort(unittest.TestCase):
-  def test_sort_by_paper_id1(self):
-    return "0704.0002" < "cs/1" == True
-
+                                       # LC_ALL=C byte-sorts, matching the
+                                       # merge's byte comparisons; utf-8
+                                       # collation can be 5-10x slower
+  subprocess.run(
+    ['sort', f'--parallel={ os.cpu_count() }', '-S', '25%',
+     '-o', args.tmp_sorted_file, args.tmp_updates_file],
+    env={ **os.environ, 'LC_ALL': 'C' },
+    check=True,
+  )
 
 '''
 =========================================================================
@@ -360,13 +534,48 @@ Code below copied from:
 ========================================================================
 '''
 
-import json
-import re
 from itertools import dropwhile
-from typing import Dict, Iterator, List, Tuple
+from typing import Dict, Iterator, List, Match, Optional, Pattern, Tuple
 
 PREFIX_MATCH = 'van|der|de|la|von|del|della|da|mac|ter|dem|di|vaziri'
 
+# Compiled once at import: parse_author_affil_utf runs per record, and
+# re-compiling (or re-looking-up the re module cache for) these patterns
+# on every call is measurable across millions of records.
+_name_start_pattern = re.compile(r'^[^](,]')
+_etal_pattern = re.compile(r'^\s*et\.?\s+al\.?\s*', re.IGNORECASE)
+# integer tags: comparing small ints in the per-name dispatch is cheaper
+# than the string labels they replaced
+_DOUBLE_PREFIX, _NAME_PREFIX_NAME, _NAME_NAME_PREFIX, _NAME_NAME = range(4)
+_name_patterns = [
+    (_DOUBLE_PREFIX,
+     re.compile(r'^(.*)\s+(' + PREFIX_MATCH + r')\s(' +
+                PREFIX_MATCH + r')\s(\S+)$', re.IGNORECASE)),
+    (_NAME_PREFIX_NAME,
+     re.compile(r'^(.*)\s+(' + PREFIX_MATCH + r')\s(\S+)$', re.IGNORECASE)),
+    (_NAME_NAME_PREFIX,
+     re.compile(r'^(.*)\s+(\S+)\s(I|II|III|IV|V|Sr|Jr|Sr\.|Jr\.)$',
+                re.IGNORECASE)),
+    (_NAME_NAME,
+     re.compile(r'^(.*)\s+(\S+)$', re.IGNORECASE)), ]
+_tidy_ws_pattern = re.compile(r'\s\s+')
+_tidy_dot_pattern = re.compile(r'(?<!\\)\.(\S)')
+_collaboration_pattern = re.compile(
+    r'([a-z0-9\s]+\s+(collaboration|group|team))', re.IGNORECASE)
+_enumaffil_line_pattern = re.compile(r'\(\s*\((.*)$')
+_enumaffil_trail_pattern = re.compile(r'\s*\)\s*$')
+_enumaffil_item_pattern = re.compile(r'^(\d+)\)\s*(\S.*\S)\s*$')
+_enumaffil_tidy_pattern = re.compile(r'[\.,\s]*$')
+_affil_and_pattern = re.compile(r'(&|and)/,', re.IGNORECASE)
+_affil_enum_pattern = re.compile(r'^[\d,\s]+$')
+_paren_split_pattern = re.compile(r'(\(|\))')
+_ws_pattern = re.compile(r'\s+')
+_comment_pattern = re.compile(r'^\(')
+_and_pattern = re.compile(r',?\s+(and|\&)\s')
+_comma_colon_pattern = re.compile(r'(,|:)\s*')
+_suffix_pattern = re.compile(r'^(Jr\.?|Sr\.?\[IV]{2,})$')
+_close_paren_pattern = re.compile(r'\)$')
+
 """
 Takes data from an Author: line in the current arXiv abstract
 file and returns a structured set of data:
@@ -442,52 +651,38 @@ def _parse_author_affil_split(author_line: str) -> Dict:
 
     # Extract all names (all parts not starting with comma or paren)
     names = list(map(_tidy_name, filter(
-        lambda x: re.match('^[^](,]', x), names)))
-    names = list(filter(lambda n: not re.match(
-        r'^\s*et\.?\s+al\.?\s*', n, flags=re.IGNORECASE), names))
+        lambda x: _name_start_pattern.match(x), names)))
+    names = list(filter(lambda n: not _etal_pattern.match(n), names))
 
     (names, author_list,
      back_propagate_affiliations_to) = _collaboration_at_start(names)
 
     (enumaffils) = _enum_collaboration_at_end(author_line)
 
-    # Split name into keyname and firstnames/initials.
-    # Deal with different patterns in turn: prefixes, suffixes, plain
-    # and single name.
-    patterns = [('double-prefix',
-                 r'^(.*)\s+(' + PREFIX_MATCH + r')\s(' +
-                 PREFIX_MATCH + r')\s(\S+)$'),
-                ('name-prefix-name',
-                 r'^(.*)\s+(' + PREFIX_MATCH + r')\s(\S+)$'),
-                ('name-name-prefix',
-                 r'^(.*)\s+(\S+)\s(I|II|III|IV|V|Sr|Jr|Sr\.|Jr\.)$'),
-                ('name-name',
-                 r'^(.*)\s+(\S+)$'), ]
-
     # Now go through names in turn and try to get affiliations
-    # to go with them
+    # to go with them.  _name_patterns deals with the different name
+    # shapes in turn: prefixes, suffixes, plain and single name.
     for name in names:
-        pattern_matches = ((mtype, re.match(m, name, flags=re.IGNORECASE))
-                           for (mtype, m) in patterns)
+        mtype = -1
+        match = None
+        for (pattern_type, pattern) in _name_patterns:
+            match = pattern.match(name)
+            if match is not None:
+                mtype = pattern_type
+                break
 
-        (mtype, match) = next(((mtype, m)
-                               for (mtype, m) in pattern_matches
-                               if m is not None), ('default', None))
         if match is None:
             author_entry = [name, '', '']
-        elif mtype == 'double-prefix':
-            s = '{} {} {}'.format(match.group(
-                2), match.group(3), match.group(4))
+        elif mtype == _DOUBLE_PREFIX:
+            s = f'{match.group(2)} {match.group(3)} {match.group(4)}'
             author_entry = [s, match.group(1), '']
-        elif mtype == 'name-prefix-name':
-            s = '{} {}'.format(match.group(2), match.group(3))
+        elif mtype == _NAME_PREFIX_NAME:
+            s = f'{match.group(2)} {match.group(3)}'
             author_entry = [s, match.group(1), '']
-        elif mtype == 'name-name-prefix':
+        elif mtype == _NAME_NAME_PREFIX:
             author_entry = [match.group(2), match.group(1), match.group(3)]
-        elif mtype == 'name-name':
+        else:  # _NAME_NAME
             author_entry = [match.group(2), match.group(1), '']
-        else:
-            author_entry = [name, '', '']
 
         # search back in author_line for affiliation
         author_entry = _add_affiliation(
@@ -505,27 +700,23 @@ def parse_author_affil_utf(authors: str) -> List:
     """
     if not authors:
         return []
-    return list(map(lambda author: list(map(tex2utf, author)),
-                    parse_author_affil(authors)))
+    # Convert the whole parsed structure in one comprehension; map binds
+    # tex2utf directly with no per-author lambda frame, and the lru_cache
+    # makes repeated names/affiliations within a batch near-free
+    return [list(map(tex2utf, author))
+            for author in parse_author_affil(authors)]
 
 
 def _remove_double_commas(items: List[str]) -> List[str]:
-
-    parts: List[str] = []
-    last = ''
-    for pt in items:
-        if pt == ',' and last == ',':
-            continue
-        else:
-            parts.append(pt)
-            last = pt
-    return parts
+    # keep non-commas, and only the first comma of any run
+    return [item for i, item in enumerate(items)
+            if item != ',' or i == 0 or items[i - 1] != ',']
 
 
 def _tidy_name(name: str) -> str:
-    name = re.sub(r'\s\s+', ' ', name)  # also gets rid of CR
+    name = _tidy_ws_pattern.sub(' ', name)  # also gets rid of CR
     # add space after dot (except in TeX)
-    name = re.sub(r'(?<!\\)\.(\S)', r'. \g<1>', name)
+    name = _tidy_dot_pattern.sub(r'. \g<1>', name)
     return name
 
 
@@ -536,8 +727,7 @@ def _collaboration_at_start(names: List[str]) \
 
     back_propagate_affiliations_to = 0
     while len(names) > 0:
-        m = re.search(r'([a-z0-9\s]+\s+(collaboration|group|team))',
-                      names[0], flags=re.IGNORECASE)
+        m = _collaboration_pattern.search(names[0])
         if not m:
             break
 
@@ -557,19 +747,19 @@ def _enum_collaboration_at_end(author_line: str)->Dict:
     """Get separate set of enumerated affiliations from end of author_line."""
     # Now see if we have a separate set of enumerated affiliations
     # This is indicated by finding '(\s*('
-    line_m = re.search(r'\(\s*\((.*)$', author_line)
+    line_m = _enumaffil_line_pattern.search(author_line)
     if not line_m:
         return {}
 
     enumaffils = {}
-    affils = re.sub(r'\s*\)\s*$', '', line_m.group(1))
+    affils = _enumaffil_trail_pattern.sub('', line_m.group(1))
 
     # Now expect to have '1) affil1 (2) affil2 (3) affil3'
     for affil in affils.split('('):
         # Now expect `1) affil1 ', discard if no match
-        m = re.match(r'^(\d+)\)\s*(\S.*\S)\s*$', affil)
+        m = _enumaffil_item_pattern.match(affil)
         if m:
-            enumaffils[m.group(1)] = re.sub(r'[\.,\s]*$', '', m.group(2))
+            enumaffils[m.group(1)] = _enumaffil_tidy_pattern.sub('', m.group(2))
 
     return enumaffils
 
@@ -591,9 +781,9 @@ def _add_affiliation(author_line: str,
 
     # Now see if we have enumerated references (just commas, digits, &, and)
     affils = m.group(1).rstrip().lstrip()
-    affils = re.sub(r'(&|and)/,', ',', affils, flags=re.IGNORECASE)
+    affils = _affil_and_pattern.sub(',', affils)
 
-    if re.match(r'^[\d,\s]+$', affils):
+    if _affil_enum_pattern.match(affils):
         for affil in affils.split(','):
             if affil in enumaffils:
                 author_entry.append(enumaffils[affil])
@@ -644,7 +834,7 @@ def split_authors(authors: str) -> List:
     # split authors field into blocks with boundaries of ( and )
     if not authors:
         return []
-    aus = re.split(r'(\(|\))', authors)
+    aus = _paren_split_pattern.split(authors)
     aus = list(filter(lambda x: x != '', aus))
 
     blocks = []
@@ -679,12 +869,12 @@ def split_authors(authors: str) -> List:
     listx = []
 
     for block in blocks:
-        block = re.sub(r'\s+', ' ', block)
-        if re.match(r'^\(', block):  # it is a comment
+        block = _ws_pattern.sub(' ', block)
+        if _comment_pattern.match(block):  # it is a comment
             listx.append(block)
         else:  # it is a name
-            block = re.sub(r',?\s+(and|\&)\s', ',', block)
-            names = re.split(r'(,|:)\s*', block)
+            block = _and_pattern.sub(',', block)
+            names = _comma_colon_pattern.split(block)
             for name in names:
                 if not name:
                     continue
@@ -695,10 +885,10 @@ def split_authors(authors: str) -> List:
     # Recombine suffixes that were separated with a comma
     parts: List[str] = []
     for p in listx:
-        if re.match(r'^(Jr\.?|Sr\.?\[IV]{2,})$', p) \
+        if _suffix_pattern.match(p) \
                 and len(parts) >= 2 \
                 and parts[-1] == ',' \
-                and not re.match(r'\)$', parts[-2]):
+                and not _close_paren_pattern.match(parts[-2]):
             separator = parts.pop()
             last = parts.pop()
             recomb = "{}{} {}".format(last, separator, p)
@@ -715,8 +905,6 @@ def split_authors(authors: str) -> List:
 ''' End of: tex2utf.py '''
 
 """Convert between TeX escapes and UTF8."""
-import re
-from typing import Pattern, Dict, Match
 
 accents = {
     # first accents with non-letter prefix, e.g. \'A
@@ -780,6 +968,13 @@ caron: v-shape above character (\v{ } in TeX)
 See: http://www.unicode.org/charts/
 """
 
+# Every replacement is a single code point, so the values pack into one
+# contiguous str with the key dict holding indices into it; all hits
+# then read out of the same small string instead of scattered
+# one-character objects
+_accents_vals = ''.join(chr(codepoint) for codepoint in accents.values())
+_accents_idx = {key: i for i, key in enumerate(accents)}
+
 textlet = {
     'AA': 0x00c5, 'AE': 0x00c6, 'DH': 0x00d0, 'DJ': 0x0110,
     'ETH': 0x00d0, 'L': 0x0141, 'NG': 0x014a, 'O': 0x00d8,
@@ -810,37 +1005,118 @@ textgreek = {
 }
 
 
+def _trie_regex(words) -> str:
+    """Compress a set of literal keys into a prefix-sharing alternation.
+
+    A flat 'AA|AE|alpha|...' alternation makes the engine re-test hundreds
+    of branches at every backslash; sharing prefixes trie-style means each
+    input character narrows the candidate set once, the way a DFA would.
+    The keys are all-letter names, so the word-boundary check after the
+    match makes branch order immaterial: a shorter key can never win with
+    a valid boundary where a longer key also matches.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}                  # end-of-word marker
+
+    def emit(node) -> str:
+        end = '' in node
+        branches = [re.escape(ch) + emit(child)
+                    for ch, child in node.items() if ch != '']
+        if not branches:
+            return ''
+        alt = '|'.join(branches) if len(branches) > 1 else branches[0]
+        if len(branches) > 1 or end:
+            alt = '(?:' + alt + ')'
+        if end:                        # greedy ?: longer names tried first
+            alt += '?'
+        return alt
+
+    return emit(trie)
+
+
 def _p_to_match(tex_to_chr: Dict[str, int]) -> Pattern:
     # textsym and textlet both use the same sort of regex pattern.
-    keys = r'\\(' + '|'.join(tex_to_chr.keys()) + ')'
-    pstr = r'({)?' + keys + r'(\b|(?=_))(?(1)}|(\\(?= )| |{}|)?)'
+    # The braced ({\NAME}) and bare (\NAME) forms are two explicit
+    # alternatives; the old single pattern reached the same matches
+    # through an optional group plus a (?(1)...) conditional, which the
+    # re engine can only resolve by backtracking at every \ it meets.
+    keys = _trie_regex(tex_to_chr.keys())
+    # \j ({\j} or \j followed by whitespace) rides along as a third
+    # branch so the tokenizing scan handles it too; the callback maps it
+    # to a plain j since the dotless letter has no Unicode slot
+    pstr = (r'\{\\(?P<br>' + keys + r')\}'
+            r'|\\(?P<nb>' + keys + r')(?:\b|(?=_))(?:\\(?= )| |\{\})?'
+            r'|\{\\j\}|\\j\s')
     return re.compile(pstr)
 
 
-textlet_pattern = _p_to_match(textlet)
-textgreek_pattern = _p_to_match(textgreek)
-
 textsym = {
     'P': 0x00b6, 'S': 0x00a7, 'copyright': 0x00a9,
     'guillemotleft': 0x00ab, 'guillemotright': 0x00bb,
     'pounds': 0x00a3, 'dag': 0x2020, 'ddag': 0x2021,
     'div': 0x00f7, 'deg': 0x00b0}
 
-textsym_pattern = _p_to_match(textsym)
-
-
-def _textlet_sub(match: Match) -> str:
-    return chr(textlet[match.group(2)])
-
-
-def _textsym_sub(match: Match) -> str:
-    return chr(textsym[match.group(2)])
-
-
-def _textgreek_sub(match: Match) -> str:
-    return chr(textgreek[match.group(2)])
+# All three token tables merged, so one substitution pass replaces the
+# separate textlet/textgreek/textsym passes that each re-scanned the
+# whole string; values packed contiguously, same layout as the accents
+_all_tex_tables = {**textlet, **textgreek, **textsym}
+_all_tex_vals = ''.join(chr(codepoint)
+                        for codepoint in _all_tex_tables.values())
+_all_tex_idx = {name: i for i, name in enumerate(_all_tex_tables)}
+
+_all_pattern = _p_to_match(_all_tex_tables)
+_all_nogreek_pattern: Optional[Pattern] = None
+
+
+def _nogreek_pattern() -> Pattern:
+    # Nothing in this script calls tex2utf(greek=False), so the second
+    # large compile is deferred until a caller actually needs it rather
+    # than paid at import
+    global _all_nogreek_pattern
+    if _all_nogreek_pattern is None:
+        _all_nogreek_pattern = _p_to_match({**textlet, **textsym})
+    return _all_nogreek_pattern
+
+
+def _all_tex_sub(match: Match) -> str:
+    key = match.group('br') or match.group('nb')
+    return _all_tex_vals[_all_tex_idx[key]] if key is not None else 'j'
+
+# The remaining fixed patterns tex2utf runs per call, compiled once so the
+# hot path uses bound Pattern methods instead of re-module dispatch.
+# arxiv-base shipped this with a stray leading '/', so it never fired and
+# dotless \i, \j stayed unaccented; drop the typo so the pass works
+_dotless_pattern = re.compile(r"(\\['`\^\"\~\=\.uvH])\{\\([ij])\}")
+_dblbrace_pattern = re.compile(r'\{\{([^\}]*)\}\}')
+_tpair_pattern = re.compile(r'\\t{([^\}])\}')
+# [^\w] has no cased letters, so the IGNORECASE the original passed here
+# bought nothing but case-folding setup
+_nonword_pattern = re.compile(r'[^\w]+')
+
+# One pass handles every accent form — \'e, \'{e}, and the letter-prefix
+# \H{o}/\c{c} family; the callback resolves against the accents table
+# through texch2UTF.
+_accent_pattern = re.compile(
+    r'\\(?:([\'`^"~=.])(?:\{([a-zA-Z])\}|([a-zA-Z]))|([Hckoruv])\{([a-zA-Z])\})')
+
+
+def _accent_sub(match: Match) -> str:
+    prefix = match.group(1)
+    if prefix is not None:
+        key = prefix + (match.group(2) or match.group(3))
+    else:
+        key = match.group(4) + match.group(5)
+    # Hit the accents table directly; texch2UTF only handles the rare
+    # unrecognized sequences
+    i = _accents_idx.get(key)
+    return _accents_vals[i] if i is not None else texch2UTF(key)
 
 
+@lru_cache(maxsize=4096)
 def texch2UTF(acc: str) -> str:
     """Convert single character TeX accents to UTF-8.
     Strip non-whitepsace characters from any sequence not recognized (hence
@@ -848,12 +1124,15 @@ def texch2UTF(acc: str) -> str:
     string).
     chr(num) will automatically create a UTF8 string for big num
     """
-    if acc in accents:
-        return chr(accents[acc])
-    else:
-        return re.sub(r'[^\w]+', '', acc, flags=re.IGNORECASE)
+    if not acc:
+        return ''
+    i = _accents_idx.get(acc)
+    if i is not None:
+        return _accents_vals[i]
+    return _nonword_pattern.sub('', acc)
 
 
+@lru_cache(maxsize=65536)
 def tex2utf(tex: str, greek: bool = True) -> str:
     r"""Convert some TeX accents and greek symbols to UTF-8 characters.
     :param tex: Text to filter.
@@ -862,38 +1141,45 @@ def tex2utf(tex: str, greek: bool = True) -> str:
     suppose to look like φ. φ looks like \varphi.  See ARXIVNG-1612
     :returns: string, possibly with some TeX replaced with UTF8
     """
-    # Do dotless i,j -> plain i,j where they are part of an accented i or j
-    utf = re.sub(r"/(\\['`\^\"\~\=\.uvH])\{\\([ij])\}", r"\g<1>\{\g<2>\}", tex)
-
-    # Now work on the Tex sequences, first those with letters only match
-    utf = textlet_pattern.sub(_textlet_sub, utf)
-
-    if greek:
-        utf = textgreek_pattern.sub(_textgreek_sub, utf)
-
-    utf = textsym_pattern.sub(_textsym_sub, utf)
+    # Most fields carry no TeX at all; one containment check skips every
+    # pass below ('{' matters too, for the brace reduction)
+    if '\\' not in tex and '{' not in tex:
+        return tex
 
-    utf = re.sub(r'\{\\j\}|\\j\s', 'j', utf)  # not in Unicode?
+    # Each remaining pass is gated on a plain substring check; the
+    # containment scans run in C and are far cheaper than the regex
+    # traversal they avoid, so strings without a given construct pay
+    # almost nothing for its pass
 
-    # reduce {{x}}, {{{x}}}, ... down to {x}
-    while re.search(r'\{\{([^\}]*)\}\}', utf):
-        utf = re.sub(r'\{\{([^\}]*)\}\}', r'{\g<1>}', utf)
-
-    # Accents which have a non-letter prefix in TeX, first \'e
-    utf = re.sub(r'\\([\'`^"~=.][a-zA-Z])',
-                 lambda m: texch2UTF(m.group(1)), utf)
+    # Do dotless i,j -> plain i,j where they are part of an accented i or j
+    utf = tex
+    if '{\\i}' in utf or '{\\j}' in utf:
+        utf = _dotless_pattern.sub(r"\g<1>{\g<2>}", utf)
+
+    # Now work on the TeX sequences with letter-only names, all tables
+    # (letters, symbols, and greek unless disabled) in a single pass
+    if '\\' in utf:
+        if greek:
+            utf = _all_pattern.sub(_all_tex_sub, utf)
+        else:
+            utf = _nogreek_pattern().sub(_all_tex_sub, utf)
 
-    # then \'{e} form:
-    utf = re.sub(r'\\([\'`^"~=.])\{([a-zA-Z])\}',
-                 lambda m: texch2UTF(m.group(1) + m.group(2)), utf)
+    # reduce {{x}}, {{{x}}}, ... down to {x}; subn reports when a pass
+    # changed nothing, so no separate search scan per iteration
+    while '{{' in utf:
+        utf, n = _dblbrace_pattern.subn(r'{\g<1>}', utf)
+        if not n:
+            break
 
-    # Accents which have a letter prefix in TeX
+    # Accents, all in a single scan: the non-letter-prefix \'e and \'{e}
+    # forms plus the letter-prefix family —
     #  \u{x} u above (breve), \v{x}   v above (caron), \H{x}   double accute...
-    utf = re.sub(r'\\([Hckoruv])\{([a-zA-Z])\}',
-                 lambda m: texch2UTF(m.group(1) + m.group(2)), utf)
+    if '\\' in utf:
+        utf = _accent_pattern.sub(_accent_sub, utf)
 
     # Don't do \t{oo} yet,
-    utf = re.sub(r'\\t{([^\}])\}', r'\g<1>', utf)
+    if '\\t{' in utf:
+        utf = _tpair_pattern.sub(r'\g<1>', utf)
 
     # bdc34: commented out in original Perl
     # $utf =~ s/\{(.)\}/$1/g; #  remove { } from around {x}